@@ -7,6 +7,11 @@ from datetime import datetime
 import os
 import sys
 
+# Make the webapp package importable when run as /app/bin/<script>.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from webapp.script_db import bump_data_version
+
 DB_FILE = os.environ.get('DATABASE_PATH', '/app/data/bridgeping.db')
 URL = "https://opendata.ndw.nu/brugopeningen.xml.gz"
 TEMP_FILE = "brugopeningen.xml.gz"
@@ -179,6 +184,9 @@ def insert_bridge_openings(bridge_openings):
             print(f"Error inserting record {opening['record_id']}: {e}")
             continue
     
+    if new_records:
+        bump_data_version(cursor)
+    
     conn.commit()
     conn.close()
     
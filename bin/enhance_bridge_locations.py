@@ -5,6 +5,12 @@ import json
 import time
 from collections import defaultdict
 import os
+import sys
+
+# Make the webapp package importable when run as /app/bin/<script>.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from webapp.script_db import bump_data_version
 
 DB_FILE = os.environ.get('DATABASE_PATH', '/app/data/bridgeping.db')
 
@@ -201,6 +207,7 @@ def enhance_bridge_locations(limit=None):
         if (i + 1) % 100 == 0:
             conn.commit()
     
+    bump_data_version(cursor)
     conn.commit()
     conn.close()
     
@@ -5,6 +5,13 @@ import sqlite3
 import time
 from datetime import datetime
 import os
+import sys
+
+# Make the webapp package importable when run as /app/bin/<script>.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from webapp.map_clusters import CLUSTER_ZOOMS, cluster_cell
+from webapp.script_db import bump_data_version
 
 DB_FILE = os.environ.get('DATABASE_PATH', '/app/data/bridgeping.db')
 
@@ -132,6 +139,34 @@ def parse_bridge_data(elements):
     print(f"Parsed {len(bridges)} bridges with valid data")
     return bridges
 
+def build_bridge_clusters(cursor):
+    """Precompute per-zoom grid clusters of bridges for zoomed-out map views."""
+    cursor.execute("DELETE FROM bridge_clusters")
+    
+    cursor.execute("SELECT latitude, longitude FROM bridges")
+    points = cursor.fetchall()
+    
+    for zoom in CLUSTER_ZOOMS:
+        # (cell_lat, cell_lon) -> [latitude sum, longitude sum, bridge count]
+        cells = {}
+        for latitude, longitude in points:
+            cell = cells.setdefault(cluster_cell(latitude, longitude, zoom), [0.0, 0.0, 0])
+            cell[0] += latitude
+            cell[1] += longitude
+            cell[2] += 1
+        
+        cursor.executemany("""
+            INSERT INTO bridge_clusters
+            (zoom, cell_lat, cell_lon, latitude, longitude, bridge_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (zoom, cell_lat, cell_lon, lat_sum / count, lon_sum / count, count)
+            for (cell_lat, cell_lon), (lat_sum, lon_sum, count) in cells.items()
+        ])
+    
+    cursor.execute("SELECT COUNT(*) FROM bridge_clusters")
+    return cursor.fetchone()[0]
+
 def insert_bridges(bridges):
     """Insert bridges into database."""
     conn = sqlite3.connect(DB_FILE)
@@ -171,10 +206,14 @@ def insert_bridges(bridges):
             print(f"Error inserting bridge {bridge['osm_id']}: {e}")
             continue
     
+    # Rebuild the map clusters in the same transaction as the version bump,
+    # so the web app never caches old clusters under the new version
+    cluster_count = build_bridge_clusters(cursor)
+    bump_data_version(cursor)
     conn.commit()
     conn.close()
     
-    return new_bridges, updated_bridges
+    return new_bridges, updated_bridges, cluster_count
 
 def fetch_bridges_for_major_cities():
     """Fetch bridges for major Dutch cities."""
@@ -261,11 +300,12 @@ def main():
     print(f"\nTotal unique bridges found: {len(bridges)}")
     
     # Insert into database
-    new_count, updated_count = insert_bridges(bridges)
+    new_count, updated_count, cluster_count = insert_bridges(bridges)
     
     print(f"\n=== Import Results ===")
     print(f"New bridges added: {new_count}")
     print(f"Bridges updated: {updated_count}")
+    print(f"Map clusters built: {cluster_count}")
     
     # Show statistics
     total, named, cities = get_database_stats()
@@ -6,5 +6,11 @@ python /app/bin/init-db.py
 # Start cron in background
 service cron start
 
-# Start the web application
-exec python -m uvicorn webapp.main:app --host 0.0.0.0 --port 8000
+# Start the web application: one worker per CPU unless WEB_CONCURRENCY is set.
+# uvloop and httptools come with uvicorn[standard].
+exec python -m uvicorn webapp.main:app --host 0.0.0.0 --port 8000 \
+    --workers "${WEB_CONCURRENCY:-$(nproc)}" \
+    --loop uvloop \
+    --http httptools \
+    --no-access-log \
+    --limit-concurrency 1000
@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
-import sqlite3
 import secrets
 
+from script_db import close_db, connect_db
+
 DB_FILE = "../bridgeping.db"
 
 def add_calendar_token_column():
     """Add calendar_token column to users table and generate tokens."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect_db(DB_FILE)
     cursor = conn.cursor()
     
     # Check if column exists
@@ -21,11 +22,14 @@ def add_calendar_token_column():
         cursor.execute("SELECT id FROM users")
         users = cursor.fetchall()
         
+        tokens = []
         for user_id, in users:
-            token = secrets.token_urlsafe(32)
-            cursor.execute("UPDATE users SET calendar_token = ? WHERE id = ?", (token, user_id))
+            tokens.append((secrets.token_urlsafe(32), user_id))
             print(f"Generated token for user {user_id}")
         
+        # One prepared UPDATE reused for every user
+        cursor.executemany("UPDATE users SET calendar_token = ? WHERE id = ?", tokens)
+        
         # Create unique index
         cursor.execute("CREATE UNIQUE INDEX idx_calendar_token ON users(calendar_token)")
         
@@ -34,7 +38,7 @@ def add_calendar_token_column():
     else:
         print("Calendar token column already exists")
     
-    conn.close()
+    close_db(conn)
 
 if __name__ == "__main__":
     add_calendar_token_column()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, DateTime, text
+from sqlalchemy import create_engine, event, Column, Integer, String, ForeignKey, DateTime, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -9,9 +9,33 @@ import sqlite3
 DATABASE_PATH = os.environ.get('DATABASE_PATH', '../bridgeping.db')
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
+# Sized for the route handlers running in FastAPI's threadpool, where
+# /bridges and /timeline each hold a connection across several queries
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800
 )
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection for the read-heavy web workload."""
+    cursor = dbapi_connection.cursor()
+    # WAL lets the web app keep reading while the sync scripts write
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # Safe with WAL: a power loss can only drop the last commits, not corrupt
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    # Read pages through a 256 MB memory map instead of copying them in
+    cursor.execute("PRAGMA mmap_size=268435456")
+    # 64 MB page cache per connection (negative values are in KiB)
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -37,6 +61,22 @@ class WatchlistBridge(Base):
     
     watchlist = relationship("Watchlist", back_populates="bridges")
 
+def display_label_sql(table=None):
+    """SQL expression for a bridge's display label.
+    
+    Backs the generated bridges.display_label column. Queries that should be
+    served from a covering index inline it with a table alias instead, since
+    SQLite never treats an index as covering for a virtual generated column.
+    """
+    prefix = f"{table}." if table else ""
+    return f"""COALESCE(
+        NULLIF({prefix}name, ''),
+        NULLIF({prefix}display_name, ''),
+        NULLIF({prefix}street_name, '') || ' over ' || NULLIF({prefix}water_name, ''),
+        NULLIF({prefix}street_name, '') || ' Bridge',
+        printf('Bridge at %.5f, %.5f', {prefix}latitude, {prefix}longitude)
+    )"""
+
 def get_db():
     db = SessionLocal()
     try:
@@ -102,12 +142,46 @@ def init_db():
         )
     ''')
     
+    # Create bridge_clusters table (precomputed by fetch_osm_bridges.py for zoomed-out maps)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bridge_clusters (
+            zoom INTEGER NOT NULL,
+            cell_lat INTEGER NOT NULL,
+            cell_lon INTEGER NOT NULL,
+            latitude REAL NOT NULL,
+            longitude REAL NOT NULL,
+            bridge_count INTEGER NOT NULL,
+            PRIMARY KEY (zoom, cell_lat, cell_lon)
+        )
+    ''')
+    
+    # Create data_versions table (bumped by the sync scripts, used for HTTP caching)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
     # Create indexes
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_bridges_coords ON bridges(latitude, longitude)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_bridge_openings_coords ON bridge_openings(latitude, longitude)')
+    # Per-bridge opening lookups join on the link location, then filter by status and time
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_bo_location_status_start ON bridge_openings(latitude, longitude, status, start_time)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_bridge_openings_time ON bridge_openings(start_time, end_time)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_bo_status_start ON bridge_openings(status, start_time)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_bridges_city ON bridges(city)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_bridges_name ON bridges(name)')
+    # Lets the /bridges listings read bridges in (city, name) order without a sort
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_bridges_city_name ON bridges(city, name)')
+    # Lets the per-bridge queries read the link location without a table lookup
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_bridge_opening_links_covering ON bridge_opening_links(bridge_id, latitude, longitude)')
+    # Covers the /api/bridges/map bounds query, including the display label inputs
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_bridges_bbox_cover ON bridges(
+            latitude, longitude, name, display_name, street_name, water_name, city
+        )
+    ''')
     
     # Run migrations for existing tables
     run_migrations(cursor)
@@ -148,6 +222,27 @@ def run_migrations(cursor):
         cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_bridges_osm_id ON bridges(osm_id)")
         print("✅ Unique constraint added to osm_id!")
     
+    # Migration 3: Add generated display_label column to bridges table
+    # (generated columns are only listed by table_xinfo, not table_info)
+    cursor.execute("PRAGMA table_xinfo(bridges)")
+    all_columns = [col[1] for col in cursor.fetchall()]
+    
+    if 'display_label' not in all_columns:
+        print("Migration: Adding 'display_label' column to bridges table...")
+        cursor.execute(f"""
+            ALTER TABLE bridges ADD COLUMN display_label TEXT
+            GENERATED ALWAYS AS ({display_label_sql()}) VIRTUAL
+        """)
+        print("✅ Display label column added successfully!")
+    
+    # Migration 4: Drop the bridge_openings (latitude, longitude) index, which
+    # is a prefix of idx_bo_location_status_start
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_bridge_openings_coords'")
+    if cursor.fetchone():
+        print("Migration: Dropping redundant idx_bridge_openings_coords index...")
+        cursor.execute("DROP INDEX idx_bridge_openings_coords")
+        print("✅ Redundant coordinates index dropped!")
+    
     # Add future migrations here as needed
     # Example:
     # if 'some_column' not in columns:
@@ -1,27 +1,88 @@
 from fastapi import FastAPI, Request, Form, Depends, HTTPException, status, Response, Query
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from jinja2.utils import htmlsafe_json_dumps
+from markupsafe import Markup
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 from typing import Optional, List
+import hashlib
 import json
-from datetime import datetime, timezone
+import math
+import time
+from datetime import datetime, timedelta, timezone
 
-from webapp.database import init_db, get_db, Watchlist, WatchlistBridge
-from sqlalchemy import text
+from webapp.database import init_db, get_db, SessionLocal, display_label_sql, Watchlist, WatchlistBridge
+from sqlalchemy import bindparam, delete, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from webapp.ical_generator import generate_ical_feed
-from webapp.name_generator import generate_unique_watchlist_name, is_valid_watchlist_name
+from webapp.map_clusters import CLUSTER_ZOOMS, cluster_cell
+from webapp.name_generator import watchlist_name_candidates, is_valid_watchlist_name
 
 app = FastAPI()
 
+# Compress the map GeoJSON, bridge list pages and .ics feeds
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Initialize database
 init_db()
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="webapp/static"), name="static")
 
-# Templates
-templates = Jinja2Templates(directory="webapp/templates")
+# Templates are compiled once per process (no mtime checks, no LRU eviction)
+# and their bytecode is cached on disk for later worker starts
+templates = Jinja2Templates(
+    directory="webapp/templates",
+    auto_reload=False,
+    cache_size=-1,
+    bytecode_cache=FileSystemBytecodeCache()
+)
+
+def _db_timestamp(dt: datetime) -> str:
+    """Format a datetime like the UTC timestamps stored in bridge_openings.
+    
+    Binding this instead of calling datetime() in SQL keeps start_time
+    predicates plain range comparisons that can use its index.
+    """
+    return dt.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+def _bridges_data_version(db: Session) -> int:
+    """Return the bridges data version, bumped by the sync scripts on ingest."""
+    version = db.execute(text(
+        "SELECT version FROM data_versions WHERE name = 'bridges'"
+    )).scalar()
+    return version or 0
+
+# In-process cache for slow-changing query results: key -> (expires_at, value)
+_query_cache = {}
+
+def _cached(key, ttl, loader):
+    """Return loader()'s result for key, reusing it for ttl seconds.
+    
+    Include the bridges data version in key to drop entries as soon as the
+    sync scripts change the underlying data.
+    """
+    now = time.monotonic()
+    entry = _query_cache.get(key)
+    if entry and entry[0] > now:
+        return entry[1]
+    
+    value = loader()
+    # Handlers run in the threadpool, so snapshot the items and tolerate races
+    for expired in [k for k, (expires_at, _) in list(_query_cache.items()) if expires_at <= now]:
+        _query_cache.pop(expired, None)
+    _query_cache[key] = (now + ttl, value)
+    return value
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header contains etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return etag in [tag.strip() for tag in if_none_match.split(',')]
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -30,26 +91,73 @@ async def home(request: Request):
     })
 
 @app.get("/watchlist", response_class=HTMLResponse)
-async def create_watchlist(request: Request):
+def create_watchlist(request: Request, db: Session = Depends(get_db)):
     """Create a new watchlist with a random name"""
-    db = next(get_db())
-    
-    # Generate unique name
-    def check_exists(name):
-        return db.query(Watchlist).filter(Watchlist.name == name).first() is not None
-    
-    watchlist_name = generate_unique_watchlist_name(check_exists)
-    
-    # Create the watchlist
-    new_watchlist = Watchlist(name=watchlist_name)
-    db.add(new_watchlist)
+    # Try random names until one inserts; collisions are rare, so this is
+    # almost always a single statement
+    for watchlist_name in watchlist_name_candidates():
+        if _insert_watchlist(db, watchlist_name) is not None:
+            break
     db.commit()
     
     # Redirect to the new watchlist
     return RedirectResponse(url=f"/watchlist/{watchlist_name}", status_code=303)
 
+def _insert_watchlist(db: Session, name: str):
+    """Insert a watchlist, returning its id, or None if the name is taken"""
+    return db.execute(
+        sqlite_insert(Watchlist)
+        .values(name=name)
+        .on_conflict_do_nothing(index_elements=['name'])
+        .returning(Watchlist.id)
+    ).scalar()
+
+# Bridge suggestions only change when the sync scripts run, so they are
+# cached per data version and rebuilt at most every SUGGESTIONS_CACHE_SECONDS
+SUGGESTIONS_CACHE_SECONDS = 300
+
+def _load_bridge_suggestions(db: Session):
+    """Build the watchlist autocomplete suggestions, id map and coordinates as JSON"""
+    bridge_suggestions = []
+    bridge_id_map = {}
+    all_bridge_coords = {}
+    
+    # Query for bridges with openings or in major cities. The suggestion is
+    # the bridge's display label with its city appended, or "Bridge in <city>"
+    # for bridges with nothing better to name them by.
+    result = db.execute(text("""
+        SELECT DISTINCT b.id, b.latitude, b.longitude,
+               CASE
+                   WHEN NULLIF(b.city, '') IS NULL THEN b.display_label
+                   WHEN COALESCE(NULLIF(b.name, ''), NULLIF(b.display_name, ''), NULLIF(b.street_name, '')) IS NULL
+                       THEN printf('Bridge in %s (%.5f, %.5f)', b.city, b.latitude, b.longitude)
+                   ELSE b.display_label || ', ' || b.city
+               END
+               -- Add clock emoji for bridges with scheduled openings
+               || CASE WHEN bol.bridge_id IS NOT NULL THEN ' ⏰' ELSE '' END as suggestion,
+               CASE WHEN bol.bridge_id IS NOT NULL THEN 1 ELSE 0 END as has_openings
+        FROM bridges b
+        LEFT JOIN bridge_opening_links bol ON b.id = bol.bridge_id
+        WHERE bol.bridge_id IS NOT NULL 
+           OR (b.city IN ('Amsterdam', 'Rotterdam', 'Den Haag', 'Utrecht') AND b.name IS NOT NULL)
+        ORDER BY has_openings DESC, b.city, b.name
+        LIMIT 500
+    """))
+    
+    for bridge_id, latitude, longitude, suggestion, _has_openings in result:
+        bridge_suggestions.append(suggestion)
+        bridge_id_map[suggestion] = bridge_id
+        all_bridge_coords[bridge_id] = {'lat': latitude, 'lon': longitude}
+    
+    # Serialize for the template's <script> block here, so cache hits skip
+    # the tojson filter (same output: sorted keys, HTML-safe escaping)
+    return tuple(
+        htmlsafe_json_dumps(value, sort_keys=True)
+        for value in (bridge_suggestions, bridge_id_map, all_bridge_coords)
+    )
+
 @app.get("/watchlist/{watchlist_name}", response_class=HTMLResponse)
-async def view_watchlist(
+def view_watchlist(
     request: Request,
     watchlist_name: str,
     db: Session = Depends(get_db)
@@ -63,11 +171,10 @@ async def view_watchlist(
     # Get or create watchlist
     watchlist = db.query(Watchlist).filter(Watchlist.name == watchlist_name).first()
     if not watchlist:
-        # Create new watchlist if it doesn't exist
-        watchlist = Watchlist(name=watchlist_name)
-        db.add(watchlist)
+        # Create new watchlist if it doesn't exist (or another request just did)
+        _insert_watchlist(db, watchlist_name)
         db.commit()
-        db.refresh(watchlist)
+        watchlist = db.query(Watchlist).filter(Watchlist.name == watchlist_name).first()
     
     # Get bridges in watchlist
     bridges = db.query(WatchlistBridge).filter(
@@ -75,90 +182,50 @@ async def view_watchlist(
     ).order_by(WatchlistBridge.created_at.desc()).all()
     
     # Get bridge suggestions
-    bridge_suggestions = []
-    bridge_id_map = {}
-    all_bridge_coords = {}
-    
     try:
-        # Query for bridges with openings or in major cities
-        result = db.execute(text("""
-            SELECT DISTINCT b.id, b.name, b.city, b.latitude, b.longitude, 
-                   b.street_name, b.water_name, b.neighborhood, b.display_name,
-                   CASE WHEN bol.bridge_id IS NOT NULL THEN 1 ELSE 0 END as has_openings
-            FROM bridges b
-            LEFT JOIN bridge_opening_links bol ON b.id = bol.bridge_id
-            WHERE bol.bridge_id IS NOT NULL 
-               OR (b.city IN ('Amsterdam', 'Rotterdam', 'Den Haag', 'Utrecht') AND b.name IS NOT NULL)
-            ORDER BY has_openings DESC, b.city, b.name
-            LIMIT 500
-        """))
-        
-        for row in result:
-            # Build the display name
-            if row.name:
-                if row.city:
-                    suggestion = f"{row.name}, {row.city}"
-                else:
-                    suggestion = f"{row.name}"
-            elif row.display_name:
-                suggestion = f"{row.display_name}, {row.city}" if row.city else row.display_name
-            elif row.street_name and row.water_name:
-                suggestion = f"{row.street_name} over {row.water_name}, {row.city}" if row.city else f"{row.street_name} over {row.water_name}"
-            elif row.street_name:
-                suggestion = f"{row.street_name} Bridge, {row.city}" if row.city else f"{row.street_name} Bridge"
-            elif row.city:
-                suggestion = f"Bridge in {row.city} ({row.latitude:.5f}, {row.longitude:.5f})"
-            else:
-                suggestion = f"Bridge at {row.latitude:.5f}, {row.longitude:.5f}"
-            
-            # Add clock emoji for bridges with scheduled openings
-            if row.has_openings:
-                suggestion += " ⏰"
-            
-            bridge_suggestions.append(suggestion)
-            bridge_id_map[suggestion] = row.id
-            all_bridge_coords[row.id] = {'lat': row.latitude, 'lon': row.longitude}
-            
+        bridge_suggestions, bridge_id_map, all_bridge_coords = _cached(
+            ("bridge_suggestions", _bridges_data_version(db)),
+            SUGGESTIONS_CACHE_SECONDS,
+            lambda: _load_bridge_suggestions(db)
+        )
     except Exception as e:
         print(f"Could not fetch bridge suggestions: {e}")
-        bridge_suggestions = []
+        bridge_suggestions, bridge_id_map, all_bridge_coords = Markup("[]"), Markup("{}"), Markup("{}")
     
     # Get bridge location data for the map
     bridge_map_data = {}
     if bridges:
         bridge_ids = [b.bridge_id for b in bridges if b.bridge_id]
         if bridge_ids:
-            placeholders = ','.join([f':id_{i}' for i in range(len(bridge_ids))])
-            query = f"""
+            query = text("""
                 SELECT b.id, b.latitude, b.longitude, b.name,
                        CASE WHEN bol.bridge_id IS NOT NULL THEN 1 ELSE 0 END as has_openings
                 FROM bridges b
                 LEFT JOIN bridge_opening_links bol ON b.id = bol.bridge_id
-                WHERE b.id IN ({placeholders})
-            """
-            params = {f'id_{i}': bridge_id for i, bridge_id in enumerate(bridge_ids)}
-            result = db.execute(text(query), params)
+                WHERE b.id IN :ids
+            """).bindparams(bindparam('ids', expanding=True))
+            result = db.execute(query, {'ids': bridge_ids})
             
-            for row in result:
-                bridge_map_data[row.id] = {
-                    'lat': row.latitude,
-                    'lon': row.longitude,
-                    'name': row.name,
-                    'has_openings': bool(row.has_openings)
+            for bridge_id, latitude, longitude, name, has_openings in result:
+                bridge_map_data[bridge_id] = {
+                    'lat': latitude,
+                    'lon': longitude,
+                    'name': name,
+                    'has_openings': bool(has_openings)
                 }
     
     return templates.TemplateResponse("watchlist.html", {
         "request": request,
         "watchlist": watchlist,
         "bridges": bridges,
-        "bridge_suggestions": bridge_suggestions,
-        "bridge_id_map": bridge_id_map,
+        "bridge_suggestions_json": bridge_suggestions,
+        "bridge_id_map_json": bridge_id_map,
         "bridge_map_data": bridge_map_data,
-        "all_bridge_coords": all_bridge_coords
+        "all_bridge_coords_json": all_bridge_coords
     })
 
 @app.post("/watchlist/{watchlist_name}/add")
-async def add_bridge(
+def add_bridge(
     watchlist_name: str,
     bridge_name: str = Form(...),
     bridge_id: Optional[int] = Form(None),
@@ -167,8 +234,10 @@ async def add_bridge(
     """Add a bridge to a watchlist"""
     
     # Validate watchlist
-    watchlist = db.query(Watchlist).filter(Watchlist.name == watchlist_name).first()
-    if not watchlist:
+    watchlist_id = db.execute(
+        select(Watchlist.id).where(Watchlist.name == watchlist_name)
+    ).scalar()
+    if watchlist_id is None:
         raise HTTPException(status_code=404, detail="Watchlist not found")
     
     # Validate bridge name
@@ -177,15 +246,17 @@ async def add_bridge(
         return RedirectResponse(url=f"/watchlist/{watchlist_name}", status_code=303)
     
     # Check if already in watchlist
-    existing = db.query(WatchlistBridge).filter(
-        WatchlistBridge.watchlist_id == watchlist.id,
-        WatchlistBridge.bridge_name == bridge_name
-    ).first()
-    
-    if not existing:
+    existing = db.execute(
+        select(WatchlistBridge.id).where(
+            WatchlistBridge.watchlist_id == watchlist_id,
+            WatchlistBridge.bridge_name == bridge_name
+        ).limit(1)
+    ).scalar()
+    
+    if existing is None:
         # Add to watchlist
         watched_bridge = WatchlistBridge(
-            watchlist_id=watchlist.id,
+            watchlist_id=watchlist_id,
             bridge_name=bridge_name,
             bridge_id=str(bridge_id) if bridge_id else None
         )
@@ -195,7 +266,7 @@ async def add_bridge(
     return RedirectResponse(url=f"/watchlist/{watchlist_name}", status_code=303)
 
 @app.post("/watchlist/{watchlist_name}/remove/{bridge_id}")
-async def remove_bridge(
+def remove_bridge(
     watchlist_name: str,
     bridge_id: int,
     db: Session = Depends(get_db)
@@ -203,29 +274,61 @@ async def remove_bridge(
     """Remove a bridge from a watchlist"""
     
     # Validate watchlist
-    watchlist = db.query(Watchlist).filter(Watchlist.name == watchlist_name).first()
-    if not watchlist:
+    watchlist_id = db.execute(
+        select(Watchlist.id).where(Watchlist.name == watchlist_name)
+    ).scalar()
+    if watchlist_id is None:
         raise HTTPException(status_code=404, detail="Watchlist not found")
     
-    # Find and remove the bridge
-    bridge = db.query(WatchlistBridge).filter(
-        WatchlistBridge.id == bridge_id,
-        WatchlistBridge.watchlist_id == watchlist.id
-    ).first()
-    
-    if bridge:
-        db.delete(bridge)
+    # Remove the bridge, if it belongs to this watchlist
+    result = db.execute(
+        delete(WatchlistBridge).where(
+            WatchlistBridge.id == bridge_id,
+            WatchlistBridge.watchlist_id == watchlist_id
+        )
+    )
+    if result.rowcount:
         db.commit()
     
     return RedirectResponse(url=f"/watchlist/{watchlist_name}", status_code=303)
 
+OPENING_NAMES_CACHE_SECONDS = 300
+
+LINKED_OPENING_NAMES_QUERY = text("""
+    SELECT DISTINCT bo.bridge_name
+    FROM bridge_openings bo
+    JOIN bridge_opening_links bol ON (
+        bo.latitude = bol.latitude AND 
+        bo.longitude = bol.longitude
+    )
+    WHERE bol.bridge_id IN :bridge_ids
+""").bindparams(bindparam('bridge_ids', expanding=True))
+
+def _opening_names(db: Session, watched_bridges):
+    """Bridge names to match openings on for a watchlist's bridges.
+    
+    Watched bridges linked to a bridge id also match the NDW names used by
+    that bridge's openings. That lookup only changes with the opening data,
+    so it is cached per data version and set of bridge ids.
+    """
+    names = {b.bridge_name for b in watched_bridges}
+    bridge_ids = tuple(sorted({b.bridge_id for b in watched_bridges if b.bridge_id}))
+    if bridge_ids:
+        names.update(_cached(
+            ("linked_opening_names", _bridges_data_version(db), bridge_ids),
+            OPENING_NAMES_CACHE_SECONDS,
+            lambda: db.execute(LINKED_OPENING_NAMES_QUERY, {'bridge_ids': list(bridge_ids)}).scalars().all()
+        ))
+    names.discard(None)
+    return list(names)
+
 @app.get("/timeline", response_class=HTMLResponse)
 async def timeline_redirect(request: Request):
     """Redirect to create a new watchlist for timeline viewing"""
     return RedirectResponse(url="/watchlist", status_code=303)
 
 @app.get("/timeline/{watchlist_name}", response_class=HTMLResponse)
-async def timeline(
+def timeline(
     request: Request,
     watchlist_name: str,
     hours: int = Query(72, ge=1, le=168),
@@ -252,40 +355,11 @@ async def timeline(
             "watchlist": watchlist
         })
     
-    # Get bridge IDs for filtering
-    bridge_ids = [b.bridge_id for b in watched_bridges if b.bridge_id]
-    bridge_names = [b.bridge_name for b in watched_bridges]
-    
-    # Build query for openings
-    query_parts = []
-    params = {}
-    
-    if bridge_ids:
-        id_placeholders = ','.join([f':bridge_id_{i}' for i in range(len(bridge_ids))])
-        query_parts.append(f"""
-            bo.bridge_name IN (
-                SELECT DISTINCT bo2.bridge_name 
-                FROM bridge_openings bo2
-                JOIN bridge_opening_links bol ON (
-                    bo2.latitude = bol.latitude AND 
-                    bo2.longitude = bol.longitude
-                )
-                WHERE bol.bridge_id IN ({id_placeholders})
-            )
-        """)
-        for i, bid in enumerate(bridge_ids):
-            params[f'bridge_id_{i}'] = bid
-    
-    if bridge_names:
-        name_placeholders = ','.join([f':bridge_name_{i}' for i in range(len(bridge_names))])
-        query_parts.append(f"bo.bridge_name IN ({name_placeholders})")
-        for i, name in enumerate(bridge_names):
-            params[f'bridge_name_{i}'] = name
-    
-    where_clause = " OR ".join(query_parts) if query_parts else "1=1"
+    # Resolve the watched bridges to the opening names to match on
+    opening_names = _opening_names(db, watched_bridges)
     
     # Query for openings
-    query = f"""
+    query = text("""
         WITH timeline_openings AS (
             SELECT DISTINCT
                 bo.bridge_name,
@@ -302,34 +376,42 @@ async def timeline(
                 ABS(bo.latitude - b.latitude) < 0.001 AND 
                 ABS(bo.longitude - b.longitude) < 0.001
             )
-            WHERE ({where_clause})
-                AND datetime(bo.start_time) >= datetime('now')
-                AND datetime(bo.start_time) <= datetime('now', '+{hours} hours')
+            WHERE bo.bridge_name IN :bridge_names
+                AND bo.start_time >= :now
+                AND bo.start_time <= :horizon
                 AND bo.status = 'active'
         )
         SELECT * FROM timeline_openings
-        ORDER BY datetime(start_time), bridge_name
-    """
-    
-    result = db.execute(text(query), params)
+        ORDER BY start_time, bridge_name
+    """).bindparams(bindparam('bridge_names', expanding=True))
+    
+    now = datetime.now(timezone.utc)
+    result = db.execute(query, {
+        'bridge_names': opening_names,
+        'now': _db_timestamp(now),
+        'horizon': _db_timestamp(now + timedelta(hours=hours))
+    })
     
     openings = []
-    for row in result:
-        start_dt = datetime.fromisoformat(row.start_time.replace('Z', '+00:00'))
-        end_dt = datetime.fromisoformat(row.end_time.replace('Z', '+00:00'))
+    # fromisoformat accepts a trailing 'Z' as of Python 3.11
+    parse_timestamp = datetime.fromisoformat
+    for (bridge_name, start_time, end_time, latitude, longitude,
+         city, street_name, water_name, neighborhood) in result:
+        start_dt = parse_timestamp(start_time)
+        end_dt = parse_timestamp(end_time)
         
         opening = {
-            'bridge_name': row.bridge_name,
-            'start_time': row.start_time,
-            'end_time': row.end_time,
+            'bridge_name': bridge_name,
+            'start_time': start_time,
+            'end_time': end_time,
             'start_datetime': start_dt,
             'end_datetime': end_dt,
             'duration_minutes': int((end_dt - start_dt).total_seconds() / 60),
-            'city': row.city,
-            'street_name': row.street_name,
-            'water_name': row.water_name,
-            'neighborhood': row.neighborhood,
-            'coordinates': {'lat': row.latitude, 'lon': row.longitude}
+            'city': city,
+            'street_name': street_name,
+            'water_name': water_name,
+            'neighborhood': neighborhood,
+            'coordinates': {'lat': latitude, 'lon': longitude}
         }
         openings.append(opening)
     
@@ -341,8 +423,46 @@ async def timeline(
         "watchlist": watchlist
     })
 
+# Calendar clients poll feeds every few minutes. Rendered feeds are cached
+# for the current ICS_CACHE_SECONDS window and per bridges data version, and
+# clients may keep them for ICS_MAX_AGE seconds or revalidate with the ETag.
+ICS_CACHE_SECONDS = 3600
+ICS_MAX_AGE = 900
+
+def _ical_events(result):
+    """Convert opening rows into the event dicts generate_ical_feed expects"""
+    parse_timestamp = datetime.fromisoformat
+    events = []
+    for bridge_name, start_time, end_time, status, latitude, longitude, city in result:
+        events.append({
+            'bridge_name': bridge_name,
+            'start_time': parse_timestamp(start_time),
+            'end_time': parse_timestamp(end_time),
+            'status': status,
+            'latitude': latitude,
+            'longitude': longitude,
+            'bridge_city': city,
+            'location_key': f"{latitude},{longitude}"
+        })
+    return events
+
+def _ical_response(request: Request, db: Session, feed_key, build_feed):
+    """Serve a calendar feed, rendering it with build_feed() only when not cached"""
+    cache_key = ("ics", feed_key, _bridges_data_version(db), int(time.time() // ICS_CACHE_SECONDS))
+    etag = '"%s"' % hashlib.sha1(repr(cache_key).encode()).hexdigest()
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={ICS_MAX_AGE}"
+    }
+    
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=cache_headers)
+    
+    content = _cached(cache_key, ICS_CACHE_SECONDS, lambda: build_feed().encode())
+    return Response(content=content, media_type="text/calendar", headers=cache_headers)
+
 @app.get("/calendar/watchlist/{watchlist_name}.ics")
-async def calendar_feed(watchlist_name: str, db: Session = Depends(get_db)):
+def calendar_feed(request: Request, watchlist_name: str, db: Session = Depends(get_db)):
     """Generate calendar feed for a watchlist"""
     
     # Validate watchlist name format
@@ -350,13 +470,15 @@ async def calendar_feed(watchlist_name: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Invalid watchlist name")
     
     # Get watchlist
-    watchlist = db.query(Watchlist).filter(Watchlist.name == watchlist_name).first()
-    if not watchlist:
+    watchlist_id = db.execute(
+        select(Watchlist.id).where(Watchlist.name == watchlist_name)
+    ).scalar()
+    if watchlist_id is None:
         raise HTTPException(status_code=404, detail="Watchlist not found")
     
     # Get watched bridges
     watched_bridges = db.query(WatchlistBridge).filter(
-        WatchlistBridge.watchlist_id == watchlist.id
+        WatchlistBridge.watchlist_id == watchlist_id
     ).all()
     
     if not watched_bridges:
@@ -365,100 +487,97 @@ async def calendar_feed(watchlist_name: str, db: Session = Depends(get_db)):
         return Response(content=ical_content, media_type="text/calendar")
     
     # Get openings for the next 30 days
-    bridge_ids = [b.bridge_id for b in watched_bridges if b.bridge_id]
-    bridge_names = [b.bridge_name for b in watched_bridges]
-    
-    query_parts = []
-    params = {}
-    
-    if bridge_ids:
-        id_placeholders = ','.join([f':bridge_id_{i}' for i in range(len(bridge_ids))])
-        query_parts.append(f"""
-            bridge_name IN (
-                SELECT DISTINCT bo.bridge_name 
-                FROM bridge_openings bo
-                JOIN bridge_opening_links bol ON (
-                    bo.latitude = bol.latitude AND 
-                    bo.longitude = bol.longitude
-                )
-                WHERE bol.bridge_id IN ({id_placeholders})
-            )
-        """)
-        for i, bid in enumerate(bridge_ids):
-            params[f'bridge_id_{i}'] = bid
-    
-    if bridge_names:
-        name_placeholders = ','.join([f':bridge_name_{i}' for i in range(len(bridge_names))])
-        query_parts.append(f"bridge_name IN ({name_placeholders})")
-        for i, name in enumerate(bridge_names):
-            params[f'bridge_name_{i}'] = name
-    
-    where_clause = " OR ".join(query_parts) if query_parts else "1=1"
-    
-    query = f"""
-        SELECT bridge_name, start_time, end_time
-        FROM bridge_openings
-        WHERE ({where_clause})
-            AND datetime(start_time) >= datetime('now')
-            AND datetime(start_time) <= datetime('now', '+30 days')
-            AND status = 'active'
-        ORDER BY datetime(start_time)
-    """
-    
-    result = db.execute(text(query), params)
-    
-    openings = []
-    for row in result:
-        openings.append({
-            'bridge_name': row.bridge_name,
-            'start_time': row.start_time,
-            'end_time': row.end_time
+    def build_feed():
+        query = text("""
+            SELECT bo.bridge_name, bo.start_time, bo.end_time, bo.status,
+                   bo.latitude, bo.longitude,
+                   (
+                       SELECT b.city
+                       FROM bridge_opening_links bol
+                       JOIN bridges b ON b.id = bol.bridge_id
+                       WHERE bol.latitude = bo.latitude
+                           AND bol.longitude = bo.longitude
+                       ORDER BY bol.id
+                       LIMIT 1
+                   ) as city
+            FROM bridge_openings bo
+            WHERE bo.bridge_name IN :bridge_names
+                AND bo.start_time >= :now
+                AND bo.start_time <= :horizon
+                AND bo.status = 'active'
+            ORDER BY bo.start_time
+        """).bindparams(bindparam('bridge_names', expanding=True))
+        
+        now = datetime.now(timezone.utc)
+        result = db.execute(query, {
+            'bridge_names': _opening_names(db, watched_bridges),
+            'now': _db_timestamp(now),
+            'horizon': _db_timestamp(now + timedelta(days=30))
         })
+        return generate_ical_feed(_ical_events(result), f"BridgePing - {watchlist_name}")
     
-    ical_content = generate_ical_feed(openings, f"BridgePing - {watchlist_name}")
-    return Response(content=ical_content, media_type="text/calendar")
+    # The feed only changes when the watched bridges or the opening data do
+    watched = tuple(sorted((b.bridge_name, b.bridge_id or "") for b in watched_bridges))
+    return _ical_response(request, db, ("watchlist", watchlist_name, watched), build_feed)
 
 # Keep other non-auth routes (bridges, map, etc.)
-@app.get("/bridges", response_class=HTMLResponse)
-async def bridges_list(request: Request, db: Session = Depends(get_db)):
-    """List all bridges grouped by city"""
-    result = db.execute(text("""
-        SELECT b.id, b.name, b.city, b.street_name, b.water_name, b.neighborhood,
-               b.display_name, b.bridge_type, b.latitude, b.longitude,
-               CASE WHEN bol.bridge_id IS NOT NULL THEN 1 ELSE 0 END as has_openings,
-               COUNT(DISTINCT bo.id) as opening_count
-        FROM bridges b
-        LEFT JOIN bridge_opening_links bol ON b.id = bol.bridge_id
-        LEFT JOIN bridge_openings bo ON (
-            bol.latitude = bo.latitude AND 
-            bol.longitude = bo.longitude AND
-            datetime(bo.start_time) >= datetime('now') AND
-            bo.status = 'active'
+# Opening flags for the bridge listings, as correlated subqueries rather than
+# joins + GROUP BY b.id so the listing can be read in idx_bridges_city_name
+# order. CROSS JOIN pins the join order to links first, so openings are found
+# through idx_bo_location_status_start.
+BRIDGE_OPENING_COLUMNS = """
+    EXISTS (
+        SELECT 1 FROM bridge_opening_links bol WHERE bol.bridge_id = b.id
+    ) as has_openings,
+    (
+        SELECT COUNT(DISTINCT bo.id)
+        FROM bridge_opening_links bol
+        CROSS JOIN bridge_openings bo ON (
+            bo.latitude = bol.latitude AND 
+            bo.longitude = bol.longitude
         )
+        WHERE bol.bridge_id = b.id
+            AND bo.start_time >= :now
+            AND bo.status = 'active'
+    ) as opening_count
+"""
+
+# The all-cities listing aggregates every bridge and its upcoming openings.
+# It is cached per data version and rebuilt at most every
+# BRIDGES_LIST_CACHE_SECONDS, which also bounds how stale opening counts get.
+BRIDGES_LIST_CACHE_SECONDS = 300
+
+def _load_bridges_list(db: Session):
+    """Build the /bridges city listing and an ETag for its contents"""
+    result = db.execute(text(f"""
+        SELECT b.id, b.display_label, b.city, b.street_name, b.water_name, b.neighborhood,
+               b.bridge_type, b.latitude, b.longitude,
+               {BRIDGE_OPENING_COLUMNS}
+        FROM bridges b
         WHERE b.name IS NOT NULL OR b.display_name IS NOT NULL
-        GROUP BY b.id
         ORDER BY b.city, b.name
-    """))
+    """), {"now": _db_timestamp(datetime.now(timezone.utc))})
     
     # Group bridges by city
     cities = {}
-    for row in result:
-        city = row.city or "Unknown"
+    for (bridge_id, display_label, city, street_name, water_name, neighborhood,
+         bridge_type, latitude, longitude, has_openings, opening_count) in result:
+        city = city or "Unknown"
         if city not in cities:
             cities[city] = []
         
         bridge_info = {
-            'id': row.id,
-            'name': row.name or row.display_name or f"Bridge at {row.latitude:.5f}, {row.longitude:.5f}",
-            'street_name': row.street_name,
-            'water_name': row.water_name,
-            'neighborhood': row.neighborhood,
-            'bridge_type': row.bridge_type,
-            'has_openings': bool(row.has_openings),
-            'opening_count': row.opening_count,
+            'id': bridge_id,
+            'name': display_label,
+            'street_name': street_name,
+            'water_name': water_name,
+            'neighborhood': neighborhood,
+            'bridge_type': bridge_type,
+            'has_openings': bool(has_openings),
+            'opening_count': opening_count,
             'coordinates': {
-                'lat': row.latitude,
-                'lon': row.longitude
+                'lat': latitude,
+                'lon': longitude
             }
         }
         cities[city].append(bridge_info)
@@ -486,52 +605,63 @@ async def bridges_list(request: Request, db: Session = Depends(get_db)):
             'bridge_count': len(city_bridges)
         })
     
+    etag = '"%s"' % hashlib.sha1(json.dumps(sorted_cities).encode()).hexdigest()
+    return sorted_cities, cities_by_letter, etag
+
+@app.get("/bridges", response_class=HTMLResponse)
+def bridges_list(request: Request, db: Session = Depends(get_db)):
+    """List all bridges grouped by city"""
+    sorted_cities, cities_by_letter, etag = _cached(
+        ("bridges_list", _bridges_data_version(db)),
+        BRIDGES_LIST_CACHE_SECONDS,
+        lambda: _load_bridges_list(db)
+    )
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={BRIDGES_LIST_CACHE_SECONDS}"
+    }
+    
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=cache_headers)
+    
     return templates.TemplateResponse("bridges.html", {
         "request": request,
         "cities": sorted_cities,
         "cities_by_letter": cities_by_letter,
         "total_bridges": sum(len(bridges) for _, bridges in sorted_cities)
-    })
+    }, headers=cache_headers)
 
 @app.get("/bridges/{city}", response_class=HTMLResponse)
-async def bridges_by_city(
+def bridges_by_city(
     request: Request,
     city: str,
     db: Session = Depends(get_db)
 ):
     """List bridges in a specific city"""
-    result = db.execute(text("""
-        SELECT b.id, b.name, b.street_name, b.water_name, b.neighborhood,
-               b.display_name, b.bridge_type, b.latitude, b.longitude,
-               CASE WHEN bol.bridge_id IS NOT NULL THEN 1 ELSE 0 END as has_openings,
-               COUNT(DISTINCT bo.id) as opening_count
+    result = db.execute(text(f"""
+        SELECT b.id, b.display_label, b.street_name, b.water_name, b.neighborhood,
+               b.bridge_type, b.latitude, b.longitude,
+               {BRIDGE_OPENING_COLUMNS}
         FROM bridges b
-        LEFT JOIN bridge_opening_links bol ON b.id = bol.bridge_id
-        LEFT JOIN bridge_openings bo ON (
-            bol.latitude = bo.latitude AND 
-            bol.longitude = bo.longitude AND
-            datetime(bo.start_time) >= datetime('now') AND
-            bo.status = 'active'
-        )
         WHERE b.city = :city AND (b.name IS NOT NULL OR b.display_name IS NOT NULL)
-        GROUP BY b.id
         ORDER BY b.name
-    """), {"city": city})
+    """), {"city": city, "now": _db_timestamp(datetime.now(timezone.utc))})
     
     bridges = []
-    for row in result:
+    for (bridge_id, display_label, street_name, water_name, neighborhood,
+         bridge_type, latitude, longitude, has_openings, opening_count) in result:
         bridge_info = {
-            'id': row.id,
-            'name': row.name or row.display_name or f"Bridge at {row.latitude:.5f}, {row.longitude:.5f}",
-            'street_name': row.street_name,
-            'water_name': row.water_name,
-            'neighborhood': row.neighborhood,
-            'bridge_type': row.bridge_type,
-            'has_openings': bool(row.has_openings),
-            'opening_count': row.opening_count,
+            'id': bridge_id,
+            'name': display_label,
+            'street_name': street_name,
+            'water_name': water_name,
+            'neighborhood': neighborhood,
+            'bridge_type': bridge_type,
+            'has_openings': bool(has_openings),
+            'opening_count': opening_count,
             'coordinates': {
-                'lat': row.latitude,
-                'lon': row.longitude
+                'lat': latitude,
+                'lon': longitude
             }
         }
         bridges.append(bridge_info)
@@ -543,7 +673,7 @@ async def bridges_by_city(
     })
 
 @app.get("/bridge/{bridge_id}", response_class=HTMLResponse)
-async def bridge_detail(
+def bridge_detail(
     request: Request,
     bridge_id: int,
     db: Session = Depends(get_db)
@@ -571,6 +701,14 @@ async def bridge_detail(
     }
     
     if bridge.has_openings:
+        now = datetime.now(timezone.utc)
+        params = {
+            "bridge_id": bridge_id,
+            "now": _db_timestamp(now),
+            "week_ago": _db_timestamp(now - timedelta(days=7)),
+            "week_ahead": _db_timestamp(now + timedelta(days=7))
+        }
+        
         # Get upcoming openings
         result = db.execute(text("""
             SELECT DISTINCT bo.bridge_name, bo.start_time, bo.end_time
@@ -580,53 +718,32 @@ async def bridge_detail(
                 bo.longitude = bol.longitude
             )
             WHERE bol.bridge_id = :bridge_id
-                AND datetime(bo.start_time) >= datetime('now')
+                AND bo.start_time >= :now
                 AND bo.status = 'active'
-            ORDER BY datetime(bo.start_time)
+            ORDER BY bo.start_time
             LIMIT 50
-        """), {"bridge_id": bridge_id})
+        """), params)
         
-        for row in result:
+        for bridge_name, start_time, end_time in result:
             openings.append({
-                'bridge_name': row.bridge_name,
-                'start_time': row.start_time,
-                'end_time': row.end_time
+                'bridge_name': bridge_name,
+                'start_time': start_time,
+                'end_time': end_time
             })
         
-        # Calculate statistics
-        # Past week openings
-        result = db.execute(text("""
-            SELECT COUNT(DISTINCT bo.id) as count
-            FROM bridge_openings bo
-            JOIN bridge_opening_links bol ON (
-                bo.latitude = bol.latitude AND 
-                bo.longitude = bol.longitude
-            )
-            WHERE bol.bridge_id = :bridge_id
-                AND datetime(bo.start_time) >= datetime('now', '-7 days')
-                AND datetime(bo.start_time) < datetime('now')
-                AND bo.status = 'active'
-        """), {"bridge_id": bridge_id})
-        stats['total_past_week'] = result.fetchone().count or 0
-        
-        # Upcoming week openings
-        result = db.execute(text("""
-            SELECT COUNT(DISTINCT bo.id) as count
-            FROM bridge_openings bo
-            JOIN bridge_opening_links bol ON (
-                bo.latitude = bol.latitude AND 
-                bo.longitude = bol.longitude
-            )
-            WHERE bol.bridge_id = :bridge_id
-                AND datetime(bo.start_time) >= datetime('now')
-                AND datetime(bo.start_time) <= datetime('now', '+7 days')
-                AND bo.status = 'active'
-        """), {"bridge_id": bridge_id})
-        stats['upcoming_week'] = result.fetchone().count or 0
-        
-        # Average duration
+        # Calculate statistics (past week, upcoming week and average
+        # duration) in a single pass over the bridge's openings
         result = db.execute(text("""
-            SELECT AVG((julianday(bo.end_time) - julianday(bo.start_time)) * 24 * 60) as avg_duration
+            SELECT
+                COUNT(DISTINCT CASE
+                    WHEN bo.start_time >= :week_ago AND bo.start_time < :now
+                    THEN bo.id END) as total_past_week,
+                COUNT(DISTINCT CASE
+                    WHEN bo.start_time >= :now AND bo.start_time <= :week_ahead
+                    THEN bo.id END) as upcoming_week,
+                AVG(CASE
+                    WHEN bo.end_time IS NOT NULL
+                    THEN (julianday(bo.end_time) - julianday(bo.start_time)) * 24 * 60 END) as avg_duration
             FROM bridge_openings bo
             JOIN bridge_opening_links bol ON (
                 bo.latitude = bol.latitude AND 
@@ -634,9 +751,10 @@ async def bridge_detail(
             )
             WHERE bol.bridge_id = :bridge_id
                 AND bo.status = 'active'
-                AND bo.end_time IS NOT NULL
-        """), {"bridge_id": bridge_id})
-        avg_duration = result.fetchone().avg_duration
+        """), params)
+        total_past_week, upcoming_week, avg_duration = result.fetchone()
+        stats['total_past_week'] = total_past_week or 0
+        stats['upcoming_week'] = upcoming_week or 0
         stats['avg_duration'] = avg_duration if avg_duration else 0
     
     return templates.TemplateResponse("bridge_detail.html", {
@@ -651,15 +769,69 @@ async def map_view(request: Request):
     """Interactive map view"""
     return templates.TemplateResponse("map.html", {"request": request})
 
+# Bboxes larger than CLUSTER_BBOX_AREA square degrees are answered from the
+# precomputed bridge_clusters table instead of scanning individual bridges,
+# once bin/fetch_osm_bridges.py has built clusters for the zoom level.
+CLUSTER_BBOX_AREA = 1.0
+
+def _parse_bbox(bbox: str):
+    """Parse and validate a "min_lon,min_lat,max_lon,max_lat" bbox string."""
+    parts = bbox.split(',')
+    if len(parts) != 4:
+        raise HTTPException(status_code=400, detail="bbox must be min_lon,min_lat,max_lon,max_lat")
+    
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in parts)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox values must be numbers")
+    
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= max_lon <= 180):
+        raise HTTPException(status_code=400, detail="bbox is out of range")
+    
+    return min_lon, min_lat, max_lon, max_lat
+
+def _cluster_zoom(lon_span: float) -> int:
+    """Pick the cluster zoom level giving roughly 16 cells across a bbox."""
+    zoom = int(math.log2(360 * 16 / lon_span))
+    return max(CLUSTER_ZOOMS[0], min(CLUSTER_ZOOMS[-1], zoom))
+
+# Map responses are cached by clients for MAP_CACHE_MAX_AGE seconds and can be
+# revalidated with their ETag. The ETag covers the bbox snapped to BBOX_GRID
+# degrees, the bridges data version and a MAP_ETAG_WINDOW time bucket (the
+# active_openings counts slide with the clock).
+MAP_CACHE_MAX_AGE = 60
+MAP_ETAG_WINDOW = 900
+
+# Map bounds are snapped outwards to a grid of BBOX_GRID degrees (~5 km), so
+# the small jitters of a panning map produce identical queries and ETags at
+# the cost of returning slightly more bridges.
+BBOX_GRID = 0.05
+
+# Rows fetched and serialized per chunk of a streamed map response
+MAP_STREAM_BATCH = 500
+
+def _snap_bbox(min_lon, min_lat, max_lon, max_lat, step=BBOX_GRID):
+    """Snap a bbox outwards onto a grid so near-identical pans share a cache key."""
+    def down(value, limit):
+        return max(round(math.floor(value / step) * step, 6), -limit)
+    
+    def up(value, limit):
+        return min(round(math.ceil(value / step) * step, 6), limit)
+    
+    return down(min_lon, 180), down(min_lat, 90), up(max_lon, 180), up(max_lat, 90)
+
 @app.get("/api/bridges/map", response_class=JSONResponse)
-async def bridges_map_data(
+def bridges_map_data(
+    request: Request,
+    response: Response,
     bbox: Optional[str] = Query(None),
     db: Session = Depends(get_db)
 ):
     """API endpoint for map data"""
-    query = """
-        SELECT b.id, b.name, b.latitude, b.longitude, b.city, 
-               b.street_name, b.water_name, b.display_name,
+    # The label is inlined rather than read from display_label so the bounds
+    # scan stays inside idx_bridges_bbox_cover
+    query = f"""
+        SELECT b.id, {display_label_sql('b')}, b.latitude, b.longitude, b.city,
                CASE WHEN bol.bridge_id IS NOT NULL THEN 1 ELSE 0 END as has_openings,
                COUNT(DISTINCT bo.id) as active_openings
         FROM bridges b
@@ -667,59 +839,144 @@ async def bridges_map_data(
         LEFT JOIN bridge_openings bo ON (
             bol.latitude = bo.latitude AND 
             bol.longitude = bo.longitude AND
-            datetime(bo.start_time) >= datetime('now') AND
-            datetime(bo.start_time) <= datetime('now', '+7 days') AND
+            bo.start_time >= :now AND
+            bo.start_time <= :week_ahead AND
             bo.status = 'active'
         )
     """
     
-    params = {}
+    now = datetime.now(timezone.utc)
+    params = {
+        'now': _db_timestamp(now),
+        'week_ahead': _db_timestamp(now + timedelta(days=7))
+    }
+    bbox_key = "all"
+    cluster_zoom = None
     if bbox:
-        try:
-            min_lon, min_lat, max_lon, max_lat = map(float, bbox.split(','))
-            query += """
-                WHERE b.latitude BETWEEN :min_lat AND :max_lat
-                AND b.longitude BETWEEN :min_lon AND :max_lon
-            """
-            params = {
-                'min_lat': min_lat,
-                'max_lat': max_lat,
-                'min_lon': min_lon,
-                'max_lon': max_lon
-            }
-        except:
-            pass
+        min_lon, min_lat, max_lon, max_lat = _snap_bbox(*_parse_bbox(bbox))
+        bbox_key = f"{min_lon},{min_lat},{max_lon},{max_lat}"
+        if (max_lat - min_lat) * (max_lon - min_lon) > CLUSTER_BBOX_AREA:
+            cluster_zoom = _cluster_zoom(max_lon - min_lon)
+        query += """
+            WHERE b.latitude BETWEEN :min_lat AND :max_lat
+            AND b.longitude BETWEEN :min_lon AND :max_lon
+        """
+        params.update({
+            'min_lat': min_lat,
+            'max_lat': max_lat,
+            'min_lon': min_lon,
+            'max_lon': max_lon
+        })
     
     query += " GROUP BY b.id"
     
-    result = db.execute(text(query), params)
+    etag_source = f"{bbox_key}:{_bridges_data_version(db)}:{int(time.time() // MAP_ETAG_WINDOW)}"
+    etag = '"%s"' % hashlib.md5(etag_source.encode()).hexdigest()
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={MAP_CACHE_MAX_AGE}"
+    }
+    
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=cache_headers)
+    
+    response.headers.update(cache_headers)
+    
+    if cluster_zoom is not None:
+        clusters = _bridge_clusters_data(db, cluster_zoom, params)
+        if clusters is not None:
+            return clusters
+    
+    # Without a bbox this is every bridge, so stream the FeatureCollection
+    # in batches instead of building the whole list in memory
+    return StreamingResponse(
+        _stream_bridge_features(text(query), params),
+        media_type="application/json",
+        headers=cache_headers
+    )
+
+def _stream_bridge_features(query, params):
+    """Yield a GeoJSON FeatureCollection for the map query, one batch at a time.
+    
+    The body is sent after the handler returns, when the request's get_db
+    session may already be closed, so the query runs on its own session.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(query, params).yield_per(MAP_STREAM_BATCH)
+        yield '{"type":"FeatureCollection","features":['
+        separator = ""
+        for rows in result.partitions():
+            features = []
+            for bridge_id, name, latitude, longitude, city, has_openings, active_openings in rows:
+                features.append(json.dumps({
+                    "type": "Feature",
+                    "properties": {
+                        "id": bridge_id,
+                        "name": name,
+                        "city": city,
+                        "has_openings": bool(has_openings),
+                        "active_openings": active_openings
+                    },
+                    "geometry": {
+                        "type": "Point",
+                        "coordinates": [longitude, latitude]
+                    }
+                }, ensure_ascii=False, separators=(",", ":")))
+            yield separator + ",".join(features)
+            separator = ","
+        yield "]}"
+    finally:
+        db.close()
+
+def _bridge_clusters_data(db: Session, zoom: int, params: dict):
+    """Map data for a zoomed-out bbox, from the precomputed bridge clusters.
+    
+    Returns None when no clusters exist for the zoom level yet, so the caller
+    can fall back to listing the individual bridges.
+    """
+    # Bounding the bbox corners' cells makes the lookup a range on the
+    # (zoom, cell_lat, cell_lon) primary key. A cluster's centroid lies inside
+    # its cell, so the centroid check below still decides which clusters are
+    # returned.
+    min_cell_lat, min_cell_lon = cluster_cell(params['min_lat'], params['min_lon'], zoom)
+    max_cell_lat, max_cell_lon = cluster_cell(params['max_lat'], params['max_lon'], zoom)
+    result = db.execute(text("""
+        SELECT latitude, longitude, bridge_count
+        FROM bridge_clusters
+        WHERE zoom = :zoom
+            AND cell_lat BETWEEN :min_cell_lat AND :max_cell_lat
+            AND cell_lon BETWEEN :min_cell_lon AND :max_cell_lon
+            AND latitude BETWEEN :min_lat AND :max_lat
+            AND longitude BETWEEN :min_lon AND :max_lon
+    """), {
+        **params,
+        'zoom': zoom,
+        'min_cell_lat': min_cell_lat,
+        'max_cell_lat': max_cell_lat,
+        'min_cell_lon': min_cell_lon,
+        'max_cell_lon': max_cell_lon
+    })
     
     features = []
-    for row in result:
-        name = row.name or row.display_name
-        if not name:
-            if row.street_name and row.water_name:
-                name = f"{row.street_name} over {row.water_name}"
-            elif row.street_name:
-                name = f"{row.street_name} Bridge"
-            else:
-                name = f"Bridge at {row.latitude:.5f}, {row.longitude:.5f}"
-        
-        feature = {
+    for latitude, longitude, bridge_count in result:
+        features.append({
             "type": "Feature",
             "properties": {
-                "id": row.id,
-                "name": name,
-                "city": row.city,
-                "has_openings": bool(row.has_openings),
-                "active_openings": row.active_openings
+                "cluster": True,
+                "count": bridge_count
             },
             "geometry": {
                 "type": "Point",
-                "coordinates": [row.longitude, row.latitude]
+                "coordinates": [longitude, latitude]
             }
-        }
-        features.append(feature)
+        })
+    
+    if not features and db.execute(
+        text("SELECT 1 FROM bridge_clusters WHERE zoom = :zoom LIMIT 1"),
+        {'zoom': zoom}
+    ).first() is None:
+        return None
     
     return {
         "type": "FeatureCollection",
@@ -727,44 +984,44 @@ async def bridges_map_data(
     }
 
 @app.get("/calendar/bridge/{bridge_id}.ics")
-async def bridge_calendar(bridge_id: int, db: Session = Depends(get_db)):
+def bridge_calendar(request: Request, bridge_id: int, db: Session = Depends(get_db)):
     """Public calendar feed for a specific bridge"""
     # Get bridge info
     result = db.execute(text("""
-        SELECT name, display_name FROM bridges WHERE id = :bridge_id
+        SELECT display_label FROM bridges WHERE id = :bridge_id
     """), {"bridge_id": bridge_id})
     
     bridge = result.fetchone()
     if not bridge:
         raise HTTPException(status_code=404, detail="Bridge not found")
     
-    bridge_name = bridge.name or bridge.display_name or f"Bridge {bridge_id}"
-    
-    # Get openings
-    result = db.execute(text("""
-        SELECT DISTINCT bo.bridge_name, bo.start_time, bo.end_time
-        FROM bridge_openings bo
-        JOIN bridge_opening_links bol ON (
-            bo.latitude = bol.latitude AND 
-            bo.longitude = bol.longitude
-        )
-        WHERE bol.bridge_id = :bridge_id
-            AND datetime(bo.start_time) >= datetime('now')
-            AND datetime(bo.start_time) <= datetime('now', '+30 days')
-            AND bo.status = 'active'
-        ORDER BY datetime(bo.start_time)
-    """), {"bridge_id": bridge_id})
+    bridge_name = bridge.display_label
     
-    openings = []
-    for row in result:
-        openings.append({
-            'bridge_name': row.bridge_name,
-            'start_time': row.start_time,
-            'end_time': row.end_time
+    def build_feed():
+        # Get openings
+        now = datetime.now(timezone.utc)
+        result = db.execute(text("""
+            SELECT DISTINCT bo.bridge_name, bo.start_time, bo.end_time, bo.status,
+                   bo.latitude, bo.longitude, b.city
+            FROM bridge_openings bo
+            JOIN bridge_opening_links bol ON (
+                bo.latitude = bol.latitude AND 
+                bo.longitude = bol.longitude
+            )
+            JOIN bridges b ON b.id = bol.bridge_id
+            WHERE bol.bridge_id = :bridge_id
+                AND bo.start_time >= :now
+                AND bo.start_time <= :horizon
+                AND bo.status = 'active'
+            ORDER BY bo.start_time
+        """), {
+            "bridge_id": bridge_id,
+            "now": _db_timestamp(now),
+            "horizon": _db_timestamp(now + timedelta(days=30))
         })
+        return generate_ical_feed(_ical_events(result), f"BridgePing - {bridge_name}")
     
-    ical_content = generate_ical_feed(openings, f"BridgePing - {bridge_name}")
-    return Response(content=ical_content, media_type="text/calendar")
+    return _ical_response(request, db, ("bridge", bridge_id), build_feed)
 
 @app.get("/faq", response_class=HTMLResponse)
 async def faq(request: Request):
@@ -0,0 +1,13 @@
+import math
+
+# Grid behind the bridge_clusters table. bin/fetch_osm_bridges.py builds one
+# row per occupied cell for each zoom level, and the /api/bridges/map handler
+# looks them up for zoomed-out bboxes. A zoom level's cells are
+# 360 / 2**zoom degrees wide.
+CLUSTER_ZOOMS = range(4, 11)
+
+def cluster_cell(lat: float, lon: float, zoom: int):
+    """Return the (cell_lat, cell_lon) grid cell containing a point at a zoom level."""
+    cell_size = 360.0 / (1 << zoom)
+    # Offset coordinates so they are never negative before flooring
+    return math.floor((lat + 90) / cell_size), math.floor((lon + 180) / cell_size)
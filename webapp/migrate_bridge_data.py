@@ -2,33 +2,30 @@
 import sqlite3
 from datetime import datetime
 
+from script_db import bump_data_version, close_db, connect_db, link_opening_locations
+
 DB_FILE = "/home/josh/claude/bridgeping/app/bridgeping.db"
 
-def add_bridge_id_column():
+def add_bridge_id_column(conn):
     """Add bridge_id column to watched_bridges table."""
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
     
-    # Check if column already exists
-    cursor.execute("PRAGMA table_info(watched_bridges)")
-    columns = [column[1] for column in cursor.fetchall()]
-    
-    if 'bridge_id' not in columns:
-        print("Adding bridge_id column to watched_bridges table...")
+    # Let the ALTER itself detect an existing column rather than reading the schema first
+    try:
         cursor.execute("""
             ALTER TABLE watched_bridges 
             ADD COLUMN bridge_id INTEGER REFERENCES bridges(id)
         """)
-        conn.commit()
-        print("Column added successfully.")
-    else:
+    except sqlite3.OperationalError as e:
+        if 'duplicate column name' not in str(e):
+            raise
         print("bridge_id column already exists.")
-    
-    conn.close()
+    else:
+        conn.commit()
+        print("Added bridge_id column to watched_bridges table.")
 
-def add_bridge_location_to_openings():
+def add_bridge_location_to_openings(conn):
     """Add latitude/longitude index to bridge_openings for faster matching."""
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
     
     print("Creating spatial index on bridge_openings...")
@@ -36,67 +33,58 @@ def add_bridge_location_to_openings():
         CREATE INDEX IF NOT EXISTS idx_bridge_openings_location 
         ON bridge_openings(latitude, longitude)
     """)
+    cursor.execute("ANALYZE bridge_openings")
     
     conn.commit()
-    conn.close()
 
-def match_existing_bridges():
+def match_existing_bridges(conn):
     """Match existing watched bridges to the bridges table based on name."""
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
     
-    # Get all watched bridges without bridge_id
-    cursor.execute("""
-        SELECT id, bridge_name 
-        FROM watched_bridges 
-        WHERE bridge_id IS NULL
-    """)
-    
-    unmatched = cursor.fetchall()
-    matched_count = 0
+    cursor.execute("SELECT COUNT(*) FROM watched_bridges WHERE bridge_id IS NULL")
+    unmatched_count = cursor.fetchone()[0]
+    
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_bridges_name ON bridges(name)")
+    
+    # First match on the exact bridge name, then retry the rest on just the
+    # bridge name part (before the city) of names like "Name, City"
+    matches = []
+    for name_expr, condition in [
+        ("watched_bridges.bridge_name", ""),
+        ("TRIM(substr(watched_bridges.bridge_name, 1, instr(watched_bridges.bridge_name, ',') - 1))",
+         "AND instr(watched_bridges.bridge_name, ', ') > 0"),
+    ]:
+        cursor.execute(f"""
+            UPDATE watched_bridges 
+            SET bridge_id = b.id
+            FROM (
+                SELECT name, MIN(id) AS id
+                FROM bridges
+                GROUP BY name
+            ) b
+            WHERE watched_bridges.bridge_id IS NULL
+            {condition}
+            AND b.name = {name_expr}
+            RETURNING bridge_name, bridge_id
+        """)
+        matches.extend(cursor.fetchall())
     
-    for watch_id, bridge_name in unmatched:
-        # Try to find a matching bridge
-        # First try exact name match
-        cursor.execute("""
-            SELECT id FROM bridges 
-            WHERE name = ? 
-            LIMIT 1
-        """, (bridge_name,))
-        
-        result = cursor.fetchone()
-        
-        if not result and ', ' in bridge_name:
-            # Try matching just the bridge name part (before city)
-            name_part = bridge_name.split(',')[0].strip()
-            cursor.execute("""
-                SELECT id FROM bridges 
-                WHERE name = ? 
-                LIMIT 1
-            """, (name_part,))
-            result = cursor.fetchone()
-        
-        if result:
-            # Update the watched bridge with the bridge_id
-            cursor.execute("""
-                UPDATE watched_bridges 
-                SET bridge_id = ? 
-                WHERE id = ?
-            """, (result[0], watch_id))
-            matched_count += 1
-            print(f"Matched '{bridge_name}' to bridge ID {result[0]}")
+    for bridge_name, bridge_id in matches:
+        print(f"Matched '{bridge_name}' to bridge ID {bridge_id}")
+    matched_count = len(matches)
     
     conn.commit()
-    conn.close()
     
-    print(f"\nMatched {matched_count} out of {len(unmatched)} watched bridges.")
+    print(f"\nMatched {matched_count} out of {unmatched_count} watched bridges.")
 
-def create_bridge_opening_links():
+def create_bridge_opening_links(conn):
     """Create a link table between bridges and their opening schedules."""
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
     
     print("Creating bridge_opening_links table...")
+    # Take the write lock up front so the table setup, link insert and
+    # version bump are committed as one transaction.
+    cursor.execute("BEGIN IMMEDIATE")
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS bridge_opening_links (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -114,57 +102,47 @@ def create_bridge_opening_links():
         ON bridge_opening_links(latitude, longitude)
     """)
     
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bridge_opening_links_covering
+        ON bridge_opening_links(bridge_id, latitude, longitude)
+    """)
+    
     # Match bridges to opening locations based on coordinates
     print("Matching bridges to opening locations...")
     
-    # Get unique opening locations
+    # Count unique opening locations
     cursor.execute("""
-        SELECT DISTINCT 
-            ROUND(latitude, 4) as lat,
-            ROUND(longitude, 4) as lon
-        FROM bridge_openings
+        SELECT COUNT(*) FROM (
+            SELECT DISTINCT ROUND(latitude, 4), ROUND(longitude, 4)
+            FROM bridge_openings
+        )
     """)
+    opening_location_count = cursor.fetchone()[0]
     
-    opening_locations = cursor.fetchall()
-    matched_locations = 0
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM bridge_opening_links")
+    last_link_id = cursor.fetchone()[0]
     
-    for lat, lon in opening_locations:
-        # Find bridges within ~100 meters of this location
-        cursor.execute("""
-            SELECT id, name, latitude, longitude
-            FROM bridges
-            WHERE ABS(latitude - ?) < 0.001 
-            AND ABS(longitude - ?) < 0.001
-            ORDER BY 
-                (latitude - ?) * (latitude - ?) + 
-                (longitude - ?) * (longitude - ?)
-            LIMIT 1
-        """, (lat, lon, lat, lat, lon, lon))
-        
-        bridge = cursor.fetchone()
-        
-        if bridge:
-            try:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO bridge_opening_links 
-                    (bridge_id, opening_location_key, latitude, longitude)
-                    VALUES (?, ?, ?, ?)
-                """, (bridge[0], f"{lat},{lon}", lat, lon))
-                
-                if cursor.rowcount > 0:
-                    matched_locations += 1
-                    print(f"Linked bridge '{bridge[1]}' to opening location {lat},{lon}")
-            except Exception as e:
-                print(f"Error linking bridge: {e}")
+    matched_locations = link_opening_locations(cursor)
+    
+    cursor.execute("""
+        SELECT b.name, bol.latitude, bol.longitude
+        FROM bridge_opening_links bol
+        JOIN bridges b ON b.id = bol.bridge_id
+        WHERE bol.id > ?
+        ORDER BY bol.id
+    """, (last_link_id,))
+    for name, lat, lon in cursor:
+        print(f"Linked bridge '{name}' to opening location {lat},{lon}")
+    
+    if matched_locations:
+        bump_data_version(cursor)
     
     conn.commit()
-    conn.close()
     
-    print(f"\nLinked {matched_locations} out of {len(opening_locations)} opening locations to bridges.")
+    print(f"\nLinked {matched_locations} out of {opening_location_count} opening locations to bridges.")
 
-def show_statistics():
+def show_statistics(conn):
     """Show statistics about the linked data."""
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
     
     print("\n=== Database Statistics ===")
@@ -175,7 +153,14 @@ def show_statistics():
     print(f"Total bridges (OSM): {total_bridges}")
     
     # Total opening locations
-    cursor.execute("SELECT COUNT(DISTINCT ROUND(latitude, 4) || ',' || ROUND(longitude, 4)) FROM bridge_openings")
+    cursor.execute("""
+        SELECT COUNT(*) FROM (
+            SELECT 1
+            FROM bridge_openings
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+            GROUP BY ROUND(latitude, 4), ROUND(longitude, 4)
+        )
+    """)
     total_opening_locations = cursor.fetchone()[0]
     print(f"Total opening locations (NDW): {total_opening_locations}")
     
@@ -190,28 +175,30 @@ def show_statistics():
     cursor.execute("SELECT COUNT(*) FROM watched_bridges")
     total_watched = cursor.fetchone()[0]
     print(f"Watched bridges with bridge_id: {watched_with_id}/{total_watched}")
-    
-    conn.close()
 
 def main():
     print("=== Bridge Data Migration ===")
     print(f"Database: {DB_FILE}")
     print()
     
-    # Step 1: Add bridge_id column
-    add_bridge_id_column()
-    
-    # Step 2: Add indexes
-    add_bridge_location_to_openings()
-    
-    # Step 3: Match existing watched bridges
-    match_existing_bridges()
-    
-    # Step 4: Create bridge-opening links
-    create_bridge_opening_links()
-    
-    # Step 5: Show statistics
-    show_statistics()
+    conn = connect_db(DB_FILE)
+    try:
+        # Step 1: Add bridge_id column
+        add_bridge_id_column(conn)
+        
+        # Step 2: Add indexes
+        add_bridge_location_to_openings(conn)
+        
+        # Step 3: Match existing watched bridges
+        match_existing_bridges(conn)
+        
+        # Step 4: Create bridge-opening links
+        create_bridge_opening_links(conn)
+        
+        # Step 5: Show statistics
+        show_statistics(conn)
+    finally:
+        close_db(conn)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,11 +2,11 @@
 """
 Migration script to convert from user-based watchlists to URL-based watchlists
 """
-import sqlite3
 import os
 import sys
 from datetime import datetime
 from name_generator import generate_unique_watchlist_name
+from script_db import close_db, connect_db
 
 def migrate_database(db_path):
     """Migrate from user-based to URL-based watchlists"""
@@ -15,7 +15,7 @@ def migrate_database(db_path):
         print(f"Database not found at {db_path}")
         return False
     
-    conn = sqlite3.connect(db_path)
+    conn = connect_db(db_path)
     cursor = conn.cursor()
     
     try:
@@ -48,57 +48,56 @@ def migrate_database(db_path):
             )
         """)
         
-        # Create indexes
-        cursor.execute("CREATE INDEX idx_watchlist_name ON watchlists(name)")
-        cursor.execute("CREATE INDEX idx_watchlist_bridges_watchlist_id ON watchlist_bridges(watchlist_id)")
-        cursor.execute("CREATE INDEX idx_watchlist_bridges_bridge_id ON watchlist_bridges(bridge_id)")
-        
         # Check if we have existing user data to migrate
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
         if cursor.fetchone():
             print("Migrating existing user watchlists...")
             
-            # Function to check if name exists
+            # Pick every user's watchlist name up front, checking candidates
+            # against the names already handed out this run
+            used_names = set()
+            
             def name_exists(name):
-                cursor.execute("SELECT 1 FROM watchlists WHERE name = ?", (name,))
-                return cursor.fetchone() is not None
+                return name in used_names
+            
+            cursor.execute("SELECT id, email FROM users ORDER BY id")
+            user_watchlists = []
+            for user_id, email in cursor:
+                watchlist_name = generate_unique_watchlist_name(name_exists)
+                used_names.add(watchlist_name)
+                user_watchlists.append((user_id, watchlist_name))
+                print(f"  Created watchlist '{watchlist_name}' for user {email}")
             
-            # Get all users with their watchlists
             cursor.execute("""
-                SELECT u.id, u.email, u.calendar_token, wb.bridge_name, wb.bridge_id, wb.created_at
-                FROM users u
-                LEFT JOIN watched_bridges wb ON u.id = wb.user_id
-                ORDER BY u.id
+                CREATE TEMP TABLE user_watchlist_map (
+                    user_id INTEGER PRIMARY KEY,
+                    watchlist_name TEXT NOT NULL
+                )
             """)
+            cursor.executemany(
+                "INSERT INTO user_watchlist_map (user_id, watchlist_name) VALUES (?, ?)",
+                user_watchlists
+            )
             
-            user_data = cursor.fetchall()
-            current_user_id = None
-            watchlist_name = None
-            watchlist_id = None
-            migrated_count = 0
+            # Create all watchlists, then copy every user's bridges across in bulk
+            now = datetime.now()
+            cursor.execute("""
+                INSERT INTO watchlists (name, created_at)
+                SELECT watchlist_name, ?
+                FROM user_watchlist_map
+                ORDER BY user_id
+            """, (now,))
+            migrated_count = cursor.rowcount
             
-            for row in user_data:
-                user_id, email, calendar_token, bridge_name, bridge_id, created_at = row
-                
-                # Create new watchlist for each user
-                if user_id != current_user_id:
-                    current_user_id = user_id
-                    watchlist_name = generate_unique_watchlist_name(name_exists)
-                    
-                    cursor.execute(
-                        "INSERT INTO watchlists (name, created_at) VALUES (?, ?)",
-                        (watchlist_name, datetime.now())
-                    )
-                    watchlist_id = cursor.lastrowid
-                    migrated_count += 1
-                    print(f"  Created watchlist '{watchlist_name}' for user {email}")
-                
-                # Add bridges to the watchlist
-                if bridge_name and watchlist_id:
-                    cursor.execute(
-                        "INSERT INTO watchlist_bridges (watchlist_id, bridge_name, bridge_id, created_at) VALUES (?, ?, ?, ?)",
-                        (watchlist_id, bridge_name, bridge_id, created_at or datetime.now())
-                    )
+            cursor.execute("""
+                INSERT INTO watchlist_bridges (watchlist_id, bridge_name, bridge_id, created_at)
+                SELECT w.id, wb.bridge_name, wb.bridge_id, COALESCE(wb.created_at, ?)
+                FROM watched_bridges wb
+                JOIN user_watchlist_map m ON m.user_id = wb.user_id
+                JOIN watchlists w ON w.name = m.watchlist_name
+                WHERE wb.bridge_name IS NOT NULL AND wb.bridge_name != ''
+                ORDER BY m.user_id
+            """, (now,))
             
             print(f"Migrated {migrated_count} user watchlists")
             
@@ -125,6 +124,16 @@ def migrate_database(db_path):
                 ) w
             """)
         
+        # Create indexes once the tables are loaded, so the bulk inserts
+        # don't have to maintain them row by row
+        cursor.execute("CREATE INDEX idx_watchlist_name ON watchlists(name)")
+        cursor.execute("CREATE INDEX idx_watchlist_bridges_watchlist_id ON watchlist_bridges(watchlist_id)")
+        cursor.execute("CREATE INDEX idx_watchlist_bridges_bridge_id ON watchlist_bridges(bridge_id)")
+        
+        # Give the planner statistics for the freshly filled tables and indexes
+        cursor.execute("ANALYZE watchlists")
+        cursor.execute("ANALYZE watchlist_bridges")
+        
         conn.commit()
         print("Migration completed successfully!")
         
@@ -146,7 +155,7 @@ def migrate_database(db_path):
         conn.rollback()
         return False
     finally:
-        conn.close()
+        close_db(conn)
 
 
 if __name__ == "__main__":
@@ -4,7 +4,7 @@ import string
 # Docker-style name generation
 # Adjectives + famous scientists/inventors
 
-ADJECTIVES = [
+ADJECTIVES = (
     "admiring", "adoring", "affectionate", "agitated", "amazing", "angry",
     "awesome", "blissful", "bold", "boring", "brave", "brilliant", "busy",
     "charming", "clever", "cool", "compassionate", "competent", "confident",
@@ -21,9 +21,9 @@ ADJECTIVES = [
     "stoic", "stupefied", "suspicious", "sweet", "tender", "thirsty",
     "trusting", "unruffled", "upbeat", "vibrant", "vigilant", "vigorous",
     "wizardly", "wonderful", "xenodochial", "youthful", "zealous", "zen"
-]
+)
 
-NAMES = [
+NAMES = (
     "agnesi", "albattani", "allen", "almeida", "antonelli", "archimedes",
     "ardinghelli", "aryabhata", "austin", "babbage", "banach", "banzai",
     "bardeen", "bartik", "bassi", "beaver", "bell", "benz", "berlekamp",
@@ -60,7 +60,10 @@ NAMES = [
     "torvalds", "tu", "turing", "varahamihira", "vaughan", "visvesvaraya",
     "volhard", "villani", "wescoff", "wilbur", "wiles", "williams", "williamson",
     "wilson", "wing", "wozniak", "wright", "wu", "yalow", "yonath", "zhukovsky"
-]
+)
+
+
+NAME_COMBINATIONS = len(ADJECTIVES) * len(NAMES)
 
 
 def generate_watchlist_name():
@@ -70,19 +73,40 @@ def generate_watchlist_name():
     return f"{adjective}-{name}"
 
 
+def _watchlist_name(index):
+    """Decode an index below NAME_COMBINATIONS into its adjective-name"""
+    adjective, name = divmod(index, len(NAMES))
+    return f"{ADJECTIVES[adjective]}-{NAMES[name]}"
+
+
+def _random_suffix():
+    """Four random lowercase letters or digits"""
+    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=4))
+
+
+def watchlist_name_candidates(max_attempts=100):
+    """Yield random watchlist names, adding a random suffix after max_attempts
+
+    The plain names are drawn without replacement, so no candidate repeats.
+    """
+    for index in random.sample(range(NAME_COMBINATIONS), min(max_attempts, NAME_COMBINATIONS)):
+        yield _watchlist_name(index)
+    
+    while True:
+        yield f"{generate_watchlist_name()}-{_random_suffix()}"
+
+
 def generate_unique_watchlist_name(check_exists_func):
     """Generate a unique watchlist name, checking against existing names"""
     max_attempts = 100
-    for _ in range(max_attempts):
-        name = generate_watchlist_name()
+    for index in random.sample(range(NAME_COMBINATIONS), min(max_attempts, NAME_COMBINATIONS)):
+        name = _watchlist_name(index)
         if not check_exists_func(name):
             return name
     
     # If we couldn't find a unique name from the word lists, 
     # append random characters
-    base_name = generate_watchlist_name()
-    suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=4))
-    return f"{base_name}-{suffix}"
+    return f"{generate_watchlist_name()}-{_random_suffix()}"
 
 
 def is_valid_watchlist_name(name):
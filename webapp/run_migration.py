@@ -1,20 +1,23 @@
 #!/usr/bin/env python3
-import sqlite3
 from datetime import datetime
 import os
 
+from script_db import bump_data_version, close_db, connect_db, link_opening_locations
+
 # Use the correct database path
 DB_FILE = os.environ.get('DATABASE_PATH', '/app/data/bridgeping.db')
 if not os.path.exists(DB_FILE):
     DB_FILE = '/home/josh/bridgeping/data/bridgeping.db'
 
-def create_bridge_opening_links():
+def create_bridge_opening_links(conn):
     """Create a link table between bridges and their opening schedules."""
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
     
     print(f"Using database: {DB_FILE}")
     print("Creating bridge_opening_links table if not exists...")
+    # Take the write lock up front so the table setup, link insert and
+    # version bump are committed as one transaction.
+    cursor.execute("BEGIN IMMEDIATE")
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS bridge_opening_links (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -32,61 +35,37 @@ def create_bridge_opening_links():
         ON bridge_opening_links(latitude, longitude)
     """)
     
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bridge_opening_links_covering
+        ON bridge_opening_links(bridge_id, latitude, longitude)
+    """)
+    
     # Match bridges to opening locations based on coordinates
     print("Matching bridges to opening locations...")
     
-    # Get unique opening locations
+    # Count unique opening locations
     cursor.execute("""
-        SELECT DISTINCT 
-            ROUND(latitude, 4) as lat,
-            ROUND(longitude, 4) as lon
-        FROM bridge_openings
+        SELECT COUNT(*) FROM (
+            SELECT DISTINCT ROUND(latitude, 4), ROUND(longitude, 4)
+            FROM bridge_openings
+        )
     """)
+    opening_location_count = cursor.fetchone()[0]
     
-    opening_locations = cursor.fetchall()
-    matched_locations = 0
-    
-    print(f"Found {len(opening_locations)} unique opening locations")
-    
-    for lat, lon in opening_locations:
-        # Find bridges within ~100 meters of this location
-        cursor.execute("""
-            SELECT id, name, latitude, longitude
-            FROM bridges
-            WHERE ABS(latitude - ?) < 0.001 
-            AND ABS(longitude - ?) < 0.001
-            ORDER BY 
-                (latitude - ?) * (latitude - ?) + 
-                (longitude - ?) * (longitude - ?)
-            LIMIT 1
-        """, (lat, lon, lat, lat, lon, lon))
-        
-        bridge = cursor.fetchone()
-        
-        if bridge:
-            try:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO bridge_opening_links 
-                    (bridge_id, opening_location_key, latitude, longitude)
-                    VALUES (?, ?, ?, ?)
-                """, (bridge[0], f"{lat},{lon}", lat, lon))
-                
-                if cursor.rowcount > 0:
-                    matched_locations += 1
-                    if matched_locations % 10 == 0:
-                        print(f"Progress: {matched_locations} locations linked...")
-            except Exception as e:
-                print(f"Error linking bridge: {e}")
+    print(f"Found {opening_location_count} unique opening locations")
+    
+    matched_locations = link_opening_locations(cursor)
+    
+    if matched_locations:
+        bump_data_version(cursor)
     
     conn.commit()
-    conn.close()
     
-    print(f"\nLinked {matched_locations} out of {len(opening_locations)} opening locations to bridges.")
+    print(f"\nLinked {matched_locations} out of {opening_location_count} opening locations to bridges.")
     return matched_locations
 
-def show_statistics():
+def show_statistics(conn):
     """Show statistics about the linked data."""
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
     
     print("\n=== Database Statistics ===")
@@ -97,7 +76,14 @@ def show_statistics():
     print(f"Total bridges (OSM): {total_bridges}")
     
     # Total opening locations
-    cursor.execute("SELECT COUNT(DISTINCT ROUND(latitude, 4) || ',' || ROUND(longitude, 4)) FROM bridge_openings")
+    cursor.execute("""
+        SELECT COUNT(*) FROM (
+            SELECT 1
+            FROM bridge_openings
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+            GROUP BY ROUND(latitude, 4), ROUND(longitude, 4)
+        )
+    """)
     total_opening_locations = cursor.fetchone()[0]
     print(f"Total opening locations (NDW): {total_opening_locations}")
     
@@ -110,20 +96,22 @@ def show_statistics():
     cursor.execute("SELECT COUNT(DISTINCT bridge_id) FROM bridge_opening_links")
     bridges_with_openings = cursor.fetchone()[0]
     print(f"Bridges with opening data: {bridges_with_openings}")
-    
-    conn.close()
 
 if __name__ == "__main__":
     print("=== Running Bridge Opening Links Migration ===")
     
-    # Create bridge-opening links
-    matched = create_bridge_opening_links()
-    
-    # Show statistics
-    if matched > 0:
-        show_statistics()
-    else:
-        print("\nNo bridges were linked. This might indicate:")
-        print("- The bridges and openings are too far apart (>100m)")
-        print("- The coordinate precision doesn't match")
-        print("- Need to run bridge sync scripts first")
\ No newline at end of file
+    conn = connect_db(DB_FILE)
+    try:
+        # Create bridge-opening links
+        matched = create_bridge_opening_links(conn)
+        
+        # Show statistics
+        if matched > 0:
+            show_statistics(conn)
+        else:
+            print("\nNo bridges were linked. This might indicate:")
+            print("- The bridges and openings are too far apart (>100m)")
+            print("- The coordinate precision doesn't match")
+            print("- Need to run bridge sync scripts first")
+    finally:
+        close_db(conn)
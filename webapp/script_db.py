@@ -0,0 +1,92 @@
+"""
+Database helpers shared by the sync (bin/) and migration (webapp/) scripts.
+
+The data_versions table itself is created by database.init_db.
+"""
+import sqlite3
+
+
+def connect_db(db_path):
+    """Open the database tuned for bulk writes."""
+    conn = sqlite3.connect(db_path)
+    # WAL plus synchronous=NORMAL skips the fsync on every commit
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # ~200 MB page cache (negative values are in KiB)
+    conn.execute("PRAGMA cache_size=-200000")
+    return conn
+
+
+def close_db(conn):
+    """Refresh planner statistics for any new indexes, then close."""
+    conn.execute("PRAGMA optimize")
+    conn.close()
+
+
+def bump_data_version(cursor):
+    """Bump the bridges data version so cached map responses are invalidated."""
+    cursor.execute("""
+        INSERT INTO data_versions (name, version) VALUES ('bridges', 1)
+        ON CONFLICT(name) DO UPDATE SET
+            version = version + 1,
+            updated_at = CURRENT_TIMESTAMP
+    """)
+
+
+def link_opening_locations(cursor):
+    """Link each opening location to its nearest bridge; returns the new link count."""
+    # Index bridge points in a temporary R*Tree so each opening location's
+    # bounding box is a single tree lookup. R*Tree stores 32-bit bounds, so
+    # it only narrows the candidates; the exact distance checks stay below.
+    cursor.execute("DROP TABLE IF EXISTS temp.bridges_rtree")
+    cursor.execute("""
+        CREATE VIRTUAL TABLE temp.bridges_rtree
+        USING rtree(id, min_lat, max_lat, min_lon, max_lon)
+    """)
+    cursor.execute("""
+        INSERT INTO temp.bridges_rtree
+        SELECT id, latitude, latitude, longitude, longitude
+        FROM bridges
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+    """)
+    
+    # Link every opening location to its nearest bridge within ~100 meters in a
+    # single statement.
+    cursor.execute("""
+        INSERT OR IGNORE INTO bridge_opening_links 
+        (bridge_id, opening_location_key, latitude, longitude)
+        SELECT bridge_id, lat || ',' || lon, lat, lon
+        FROM (
+            SELECT
+                b.id AS bridge_id,
+                o.lat,
+                o.lon,
+                ROW_NUMBER() OVER (
+                    PARTITION BY o.lat, o.lon
+                    ORDER BY 
+                        (b.latitude - o.lat) * (b.latitude - o.lat) + 
+                        (b.longitude - o.lon) * (b.longitude - o.lon)
+                ) AS nearest
+            FROM (
+                SELECT DISTINCT 
+                    ROUND(latitude, 4) as lat,
+                    ROUND(longitude, 4) as lon
+                FROM bridge_openings
+            ) o
+            JOIN temp.bridges_rtree r
+              ON r.max_lat >= o.lat - 0.001 AND r.min_lat <= o.lat + 0.001
+             AND r.max_lon >= o.lon - 0.001 AND r.min_lon <= o.lon + 0.001
+            JOIN bridges b ON b.id = r.id
+             AND b.latitude > o.lat - 0.001 AND b.latitude < o.lat + 0.001
+             AND b.longitude > o.lon - 0.001 AND b.longitude < o.lon + 0.001
+        )
+        WHERE nearest = 1
+    """)
+    linked = cursor.rowcount
+    
+    # Give the planner statistics for the link table and its indexes
+    cursor.execute("ANALYZE bridges")
+    cursor.execute("ANALYZE bridge_openings")
+    cursor.execute("ANALYZE bridge_opening_links")
+    return linked